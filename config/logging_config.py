@@ -1,9 +1,11 @@
 """
 Centralized logging configuration for the Compliance Assistant.
 """
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from pathlib import Path
 
 def setup_logging(log_level="INFO", log_file="logs/compliance_assistant.log"):
@@ -48,9 +50,20 @@ def setup_logging(log_level="INFO", log_file="logs/compliance_assistant.log"):
     )
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
-    
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+
+    # Route records through a queue so callers in the hot loop only enqueue;
+    # the listener thread does the actual disk/console I/O off-path
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     return logger
@@ -3,6 +3,7 @@ LangChain LLM client using Groq for fast inference.
 """
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
+import functools
 import logging
 import os
 from dotenv import load_dotenv
@@ -10,14 +11,19 @@ from dotenv import load_dotenv
 load_dotenv()
 logger = logging.getLogger("ComplianceAssistant.LLM")
 
+@functools.lru_cache(maxsize=4)
 def get_llm_client(model="qwen/qwen3-32b", temperature=0.3):
     """
     Initialize and return Groq LLM client.
-    
+
+    The client is cached per (model, temperature) so repeated calls in the
+    per-item processing loop reuse one instance instead of re-reading env
+    vars and re-constructing ChatGroq each time.
+
     Args:
         model: Groq model name
         temperature: Sampling temperature (0-1)
-    
+
     Returns:
         LangChain ChatGroq instance
     """
@@ -26,10 +32,14 @@ def get_llm_client(model="qwen/qwen3-32b", temperature=0.3):
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
+        # Structured output fits well under 512 tokens; capping generation
+        # bounds worst-case latency per request
         llm = ChatGroq(
             groq_api_key=api_key,
             model_name=model,
-            temperature=temperature
+            temperature=temperature,
+            max_tokens=512,
+            model_kwargs={"top_p": 0.9}
         )
         
         logger.info(f"Initialized Groq LLM: {model}")
@@ -39,27 +49,16 @@ def get_llm_client(model="qwen/qwen3-32b", temperature=0.3):
         logger.error(f"Error initializing LLM: {str(e)}")
         raise
 
-def create_prerequisite_prompt():
-    """
-    Create prompt template for extracting prerequisites.
-    
-    Returns:
-        ChatPromptTemplate for prerequisite extraction
-    """
-    template = """
+# Static instructions live in the system message so the (cacheable) prompt
+# prefix is identical across items; only the human message varies. Providers
+# with prefix caching (Groq, Anthropic) can then reuse the instruction block
+# instead of re-processing it per request.
+SYSTEM_PROMPT = """
 You are a Senior Compliance Specialist and Auditor. Your task is to analyze search results and determine BOTH the technical prerequisites AND the accurate due date/expiry for a compliance item.
 
-**Compliance Item:**
-Title: {title}
-Description: {description}
-Application Date: {application_date} (The date the process was initiated)
-
-**Search Results (Raw Data):**
-{search_results}
-
 **CRITICAL INSTRUCTIONS:**
 1. **DETERMINE VALIDITY**: Look for the standard validity or renewal period for this certificate (e.g., is it valid for 1 year, 3 years, etc?).
-2. **CALCULATE DUE DATE**: Based on the [Application Date] and the validity period found in the search results, calculate the final [Calculated Due Date]. 
+2. **CALCULATE DUE DATE**: Based on the [Application Date] and the validity period found in the search results, calculate the final [Calculated Due Date].
    - Format it as YYYY-MM-DD.
    - If the standard says "3 years validity", the due date is Application Date + 3 years.
 3. **EXTRACT PREREQUISITES**: Extract a clean, numbered list of actionable requirements from official sources.
@@ -71,12 +70,36 @@ Application Date: {application_date} (The date the process was initiated)
 [DUE_DATE]: YYYY-MM-DD
 [VALIDITY_PERIOD]: e.g., 3 Years / Annual
 
-Prerequisites for {title}:
+Prerequisites for <title>:
 1. [Requirement 1]
 2. [Requirement 2]
 ...
 
 Additional Notes: [Technical context only]
 """
-    
-    return ChatPromptTemplate.from_template(template)
+
+USER_TEMPLATE = """
+**Compliance Item:**
+Title: {title}
+Description: {description}
+Application Date: {application_date} (The date the process was initiated)
+
+**Search Results (Raw Data):**
+{search_results}
+"""
+
+# Built once at import; ChatPromptTemplate construction parses the template
+# placeholders, so rebuilding it per item is wasted work.
+_PREREQ_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    ("human", USER_TEMPLATE),
+])
+
+def create_prerequisite_prompt():
+    """
+    Return the prompt template for extracting prerequisites.
+
+    Returns:
+        ChatPromptTemplate for prerequisite extraction
+    """
+    return _PREREQ_PROMPT
@@ -1,11 +1,40 @@
 from llm.llm_client import get_llm_client, create_prerequisite_prompt
 from utils.due_date_manager import DueDateManager
+import functools
 import logging
+import re
 
 logger = logging.getLogger("ComplianceAssistant.QueryHandler")
 
-# Initialize manager
-due_date_manager = DueDateManager()
+# Precompiled at module scope so the hot path avoids re's string-keyed
+# cache lookup on every call
+_ITEM_SPLIT_RE = re.compile(r"===ITEM\s*\d+===")
+
+# The output format guarantees artifact tags start their own line
+_TAG_PREFIXES = ("[DUE_DATE]:", "[VALIDITY_PERIOD]:")
+
+# Static system message for batch extraction; keeping it identical across
+# requests lets providers with prefix caching reuse the instruction block
+_BATCH_SYSTEM_PROMPT = (
+    "You are a Senior Compliance Specialist and Auditor. "
+    "Process every compliance item listed in the user message. "
+    "For EACH item, output a block starting with the exact marker `===ITEM <i>===` "
+    "(matching the item number given), followed by:\n\n"
+    "[DUE_DATE]: YYYY-MM-DD\n"
+    "[VALIDITY_PERIOD]: e.g., 3 Years / Annual\n\n"
+    "Prerequisites for <title>:\n"
+    "1. [Requirement 1]\n"
+    "2. [Requirement 2]\n"
+    "...\n\n"
+    "Determine the validity period from the search results, calculate the due date "
+    "from the Application Date, and extract a clean numbered list of actionable "
+    "requirements from official sources. Do not include <think> or any reasoning."
+)
+
+@functools.lru_cache(maxsize=1)
+def _get_due_date_manager():
+    """Construct the DueDateManager lazily on first use, not at import."""
+    return DueDateManager()
 
 def extract_prerequisites(search_results, item):
     """
@@ -21,7 +50,7 @@ def extract_prerequisites(search_results, item):
     try:
         # Step 1: Calculate high-confidence due date using DueDateManager
         logger.info("Calculating intelligent due date...")
-        dd_result = due_date_manager.calculate_due_date(item, search_results)
+        dd_result = _get_due_date_manager().calculate_due_date(item, search_results)
         
         # Step 2: Extract prerequisites using the specialized prompt
         llm = get_llm_client()
@@ -30,8 +59,9 @@ def extract_prerequisites(search_results, item):
         # Format search results for prompt
         formatted_results = format_search_results(search_results)
         
-        # Create prompt
-        prompt = prompt_template.format(
+        # Create prompt (system + human messages; the static system message
+        # is identical across items so providers can cache the prefix)
+        prompt = prompt_template.format_messages(
             title=item['Title'],
             description=item['Description'],
             application_date=item.get('Application Date', 'Not specified'),
@@ -46,25 +76,8 @@ def extract_prerequisites(search_results, item):
         content = response.content
         logger.info("Successfully received LLM response")
         
-        # Merge results
-        parsed_result = {
-            'prerequisites': content,
-            'due_date': dd_result.due_date.strftime('%Y-%m-%d'),
-            'validity': dd_result.validity_period,
-            'confidence': dd_result.confidence,
-            'calculation_method': dd_result.method.value,
-            'calculation_notes': dd_result.calculation_notes,
-            'warning': dd_result.warning
-        }
-        
-        # Clean up prerequisites text (remove any artifact tags if they still exist)
-        import re
-        clean_prereqs = re.sub(r"\[DUE_DATE\]:.*", "", content)
-        clean_prereqs = re.sub(r"\[VALIDITY_PERIOD\]:.*", "", clean_prereqs).strip()
-        parsed_result['prerequisites'] = clean_prereqs
-        
-        return parsed_result
-    
+        return _parse_extraction(content, dd_result)
+
     except Exception as e:
         logger.error(f"Error extracting prerequisites: {str(e)}")
         # Fallback: return formatted search snippets in the expected dict format
@@ -74,6 +87,140 @@ def extract_prerequisites(search_results, item):
             'validity': None
         }
 
+def extract_prerequisites_stream(search_results, item):
+    """
+    Streaming variant of extract_prerequisites.
+
+    Consumes the completion chunk by chunk and stops reading once the
+    'Additional Notes:' section appears, so the worker thread is released
+    before the provider finishes generating trailing text.
+
+    Args:
+        search_results: List of search result dictionaries
+        item: Compliance item dictionary
+
+    Returns:
+        Dictionary with prerequisites, due_date, and metadata
+    """
+    try:
+        logger.info("Calculating intelligent due date...")
+        dd_result = _get_due_date_manager().calculate_due_date(item, search_results)
+
+        llm = get_llm_client()
+        prompt = create_prerequisite_prompt().format_messages(
+            title=item['Title'],
+            description=item['Description'],
+            application_date=item.get('Application Date', 'Not specified'),
+            search_results=format_search_results(search_results)
+        )
+
+        logger.info("Streaming LLM response for prerequisite extraction")
+        pieces = []
+        tail = ""
+        for chunk in llm.stream(prompt):
+            pieces.append(chunk.content)
+            # Scan only the rolling tail for the terminator marker
+            tail = (tail + chunk.content)[-64:]
+            if "Additional Notes:" in tail:
+                break
+
+        content = "".join(pieces)
+        logger.info("Successfully received streamed LLM response")
+
+        return _parse_extraction(content, dd_result)
+
+    except Exception as e:
+        logger.error(f"Error extracting prerequisites (stream): {str(e)}")
+        return {
+            'prerequisites': format_fallback_prerequisites(search_results, item),
+            'due_date': None,
+            'validity': None
+        }
+
+def _parse_extraction(content, dd_result):
+    """Merge LLM output and due-date intelligence into the result dict."""
+    # Clean up prerequisites text (remove any artifact tags if they still
+    # exist). Tags begin at the start of a line, so one pass over the lines
+    # with str.startswith beats running the regex engine over the content.
+    kept = [
+        line for line in content.splitlines()
+        if not line.lstrip().startswith(_TAG_PREFIXES)
+    ]
+    clean_prereqs = "\n".join(kept).strip()
+
+    return {
+        'prerequisites': clean_prereqs,
+        'due_date': dd_result.due_date.strftime('%Y-%m-%d'),
+        'validity': dd_result.validity_period,
+        'confidence': dd_result.confidence,
+        'calculation_method': dd_result.method.value,
+        'calculation_notes': dd_result.calculation_notes,
+        'warning': dd_result.warning
+    }
+
+def extract_prerequisites_batch(items_with_results, batch_size=6):
+    """
+    Extract prerequisites for several compliance items with one LLM call
+    per batch instead of one call per item.
+
+    Batching amortizes the per-request network and API overhead across
+    the batch, cutting N round-trips to roughly N / batch_size.
+
+    Args:
+        items_with_results: List of (item, search_results) tuples
+        batch_size: Number of items to fold into a single prompt
+
+    Returns:
+        List of result dictionaries in the same order as the input
+    """
+    results = []
+    for start in range(0, len(items_with_results), batch_size):
+        batch = items_with_results[start:start + batch_size]
+        try:
+            results.extend(_extract_batch(batch))
+        except Exception as e:
+            logger.error(f"Batch extraction failed, falling back to per-item calls: {str(e)}")
+            results.extend(extract_prerequisites(search_results, item) for item, search_results in batch)
+    return results
+
+def _extract_batch(batch):
+    """
+    Run one LLM call for a batch of (item, search_results) tuples and
+    parse the numbered result blocks back into per-item dictionaries.
+    """
+    llm = get_llm_client()
+
+    sections = []
+    for i, (item, search_results) in enumerate(batch, 1):
+        sections.append(
+            f"===ITEM {i}===\n"
+            f"Title: {item['Title']}\n"
+            f"Description: {item['Description']}\n"
+            f"Application Date: {item.get('Application Date', 'Not specified')}\n"
+            f"Search Results:\n{format_search_results(search_results)}"
+        )
+
+    human_message = (
+        f"Process the following {len(batch)} compliance items.\n\n"
+        + "\n\n".join(sections)
+    )
+
+    logger.info(f"Invoking LLM for batch of {len(batch)} items")
+    response = llm.invoke([("system", _BATCH_SYSTEM_PROMPT), ("human", human_message)])
+
+    segments = _ITEM_SPLIT_RE.split(response.content)[1:]
+    if len(segments) != len(batch):
+        raise ValueError(
+            f"Expected {len(batch)} item blocks in batch response, got {len(segments)}"
+        )
+
+    parsed = []
+    for (item, search_results), segment in zip(batch, segments):
+        dd_result = _get_due_date_manager().calculate_due_date(item, search_results)
+        parsed.append(_parse_extraction(segment, dd_result))
+
+    return parsed
+
 def format_search_results(results):
     """
     Format search results for LLM prompt.
@@ -84,12 +231,25 @@ def format_search_results(results):
     Returns:
         Formatted string of search results
     """
-    formatted = []
-    for idx, result in enumerate(results, 1):
-        content = result.get('content') or result.get('snippet', '')
-        formatted.append(f"Source {idx}: {result['title']}\nURL: {result['url']}\n{content[:1000]}\n")
-    
-    return "\n---\n".join(formatted)
+    # The scraper's SearchResults carries parallel column lists; zipping
+    # them avoids a dict lookup per row per field
+    columns = getattr(results, 'columns', None)
+    if columns is not None:
+        return "\n---\n".join(
+            f"Source {idx}: {title}\nURL: {url}\n{content}\n"
+            for idx, (title, url, content) in enumerate(
+                zip(columns['titles'], columns['urls'], columns['prompt_contents']), 1
+            )
+        )
+
+    # Plain list-of-dicts path for results built elsewhere; the scraper
+    # pre-truncates 'prompt_content', so the .get chain and slice only
+    # run as a fallback
+    return "\n---\n".join(
+        f"Source {idx}: {result['title']}\nURL: {result['url']}\n"
+        f"{result.get('prompt_content') or (result.get('content') or result.get('snippet', ''))[:1000]}\n"
+        for idx, result in enumerate(results, 1)
+    )
 
 def format_fallback_prerequisites(results, item):
     """
@@ -102,11 +262,17 @@ def format_fallback_prerequisites(results, item):
     Returns:
         Formatted prerequisites text
     """
-    prereqs = f"Prerequisites for {item['Title']}:\n\n"
-    prereqs += "Based on web search, please review the following sources:\n\n"
-    
+    # List accumulation + join instead of repeated string concatenation,
+    # which is O(n^2) on CPython for long outputs
+    parts = [
+        f"Prerequisites for {item['Title']}:",
+        "",
+        "Based on web search, please review the following sources:",
+        ""
+    ]
+
     for idx, result in enumerate(results, 1):
-        prereqs += f"{idx}. {result['title']}\n   {result['url']}\n"
-        prereqs += f"   {result.get('snippet', '')[:200]}...\n\n"
-    
-    return prereqs
+        parts.append(f"{idx}. {result['title']}\n   {result['url']}")
+        parts.append(f"   {result.get('snippet', '')[:200]}...\n")
+
+    return "\n".join(parts)
@@ -4,26 +4,37 @@ Coordinates the workflow from Excel ingestion to Outlook notifications.
 """
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from config.logging_config import setup_logging
-from utils.excel_utils import read_new_items, check_duplicate, save_to_master
+from utils.excel_utils import read_new_items, load_master_titles, save_to_master_batch
+from utils.result_cache import get_cached_result, set_cached_result
 from scrapers.web_search_scraper import search_prerequisites
-from llm.query_handler import extract_prerequisites
-from llm.retriever import store_in_vector_db
-from notifications.outlook_notifier import send_notification
+from llm.query_handler import extract_prerequisites_batch
+from llm.retriever import build_documents, flush_to_vector_db
+from notifications.outlook_notifier import send_notifications_bulk
 
-def save_to_text_file(item_title, prerequisites, output_path="data/output/prerequisites.txt"):
-    """Save extracted prerequisites to a text file for manual verification."""
+def open_prerequisites_file(output_path="data/output/prerequisites.txt"):
+    """Open the shared prerequisites text file for the whole workflow run."""
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_file, "a", encoding="utf-8") as f:
-        f.write("=" * 80 + "\n")
-        f.write(f"ITEM: {item_title}\n")
-        f.write(f"TIMESTAMP: {Path(output_path).stat().st_mtime if output_file.exists() else 'NEW'}\n")
-        f.write("-" * 40 + "\n")
-        f.write(prerequisites + "\n")
-        f.write("=" * 80 + "\n\n")
+    # 64 KB buffer so per-item records accumulate in memory and hit disk
+    # in large chunks instead of one syscall per record
+    return open(output_file, "a", encoding="utf-8", buffering=65536)
+
+def save_to_text_file(f, item_title, prerequisites):
+    """Append extracted prerequisites to the shared text file for manual verification."""
+    # Assemble the record once and issue a single write call
+    record = "".join([
+        "=" * 80 + "\n",
+        f"ITEM: {item_title}\n",
+        f"TIMESTAMP: {os.fstat(f.fileno()).st_mtime}\n",
+        "-" * 40 + "\n",
+        prerequisites + "\n",
+        "=" * 80 + "\n\n"
+    ])
+    f.write(record)
 
 def main():
     """Main orchestration workflow for the Compliance Assistant."""
@@ -36,75 +47,162 @@ def main():
     try:
         # Step 1: Read new items from Excel form
         logger.info("Step 1: Reading new compliance items from Excel")
-        new_items = read_new_items("data/excel/new_submissions.xlsx")
+        new_items = read_new_items("data/excel/new_submissions.csv")
         logger.info(f"Found {len(new_items)} new items to process")
         
         if not new_items:
             logger.info("No new items to process. Exiting.")
             return
         
-        # Step 2: Process each item
+        # Step 2: Filter out duplicates before doing any expensive work
         processed_count = 0
         skipped_count = 0
         error_count = 0
         
-        for idx, item in enumerate(new_items, 1):
-            try:
-                logger.info(f"\n{'=' * 60}")
-                logger.info(f"Processing item {idx}/{len(new_items)}: '{item.get('Title', 'Unknown')}'")
-                logger.info(f"{'=' * 60}")
-                
-                # Check for duplicates
-                if check_duplicate(item, "data/excel/master_compliance.xlsx"):
-                    logger.info(f"Item '{item['Title']}' already exists in master list, skipping")
-                    skipped_count += 1
-                    continue
-                
-                # Step 3: Web search for prerequisites
-                logger.info(f"Step 3: Searching for prerequisites: {item['Title']}")
-                search_results = search_prerequisites(item['Title'], item['Description'])
-                
-                if not search_results:
-                    logger.warning(f"No search results found for '{item['Title']}'")
-                    continue
-                
-                # Step 4: LLM extraction
-                logger.info("Step 4: Extracting prerequisites using LLM")
-                prerequisites = extract_prerequisites(search_results, item)
-                logger.info(f"Prerequisites extracted successfully ({len(prerequisites)} characters)")
-                
-                # NEW STEP: Save output to text file for verification (as requested)
-                logger.info("Saving prerequisites to data/output/prerequisites.txt for verification")
-                save_to_text_file(item['Title'], prerequisites)
-                
-                # Step 5: Store in vector DB
-                logger.info("Step 5: Storing data in vector database")
-                store_in_vector_db(item, prerequisites, search_results)
-                
-                # Step 6: Send notification
-                logger.info(f"Step 6: Sending notification to {item['Responsible Email']}")
+        # One Excel read instead of one per item; lookups are O(1) set hits
+        existing_titles = load_master_titles("data/excel/master_compliance.xlsx")
+
+        pending_items = []
+        for item in new_items:
+            title_key = str(item['Title']).strip().lower()
+            if title_key in existing_titles:
+                logger.info(f"Item '{item['Title']}' already exists in master list, skipping")
+                skipped_count += 1
+            else:
+                pending_items.append(item)
+                # Adding here also catches duplicate rows within this
+                # submissions file, not just against the master list
+                existing_titles.add(title_key)
+
+        # Lock guarding the shared Excel/text-file writes once items are
+        # processed concurrently
+        write_lock = threading.Lock()
+
+        # Notifications and vector-store documents are collected during
+        # processing and flushed in one batch afterwards (list.append is
+        # thread-safe)
+        notifications = []
+        vector_documents = []
+        master_records = []
+
+        def _search_one(item):
+            """Run the web search for one item (thread-pool worker)."""
+            logger.info(f"Step 3: Searching for prerequisites: {item['Title']}")
+            return search_prerequisites(item['Title'], item['Description'])
+
+        def _finalize_one(item, search_results, result, prereq_file):
+            """Store, notify, and save one extracted item (thread-pool worker)."""
+            prerequisites = result['prerequisites']
+            logger.info(f"Finalizing item: '{item.get('Title', 'Unknown')}' "
+                        f"({len(prerequisites)} characters of prerequisites)")
+
+            # NEW STEP: Save output to text file for verification (as requested)
+            with write_lock:
+                save_to_text_file(prereq_file, item['Title'], prerequisites)
+
+            # Step 5: Build vector-store documents for the batched ingest
+            logger.info("Step 5: Building documents for vector database")
+            vector_documents.extend(build_documents(item, prerequisites, search_results))
+
+            # Step 6: Queue notification for the bulk send after processing
+            logger.info(f"Step 6: Queueing notification for {item['Responsible Email']}")
+            notifications.append({
+                'to_email': item['Responsible Email'],
+                'subject': f"New Compliance Item: {item['Title']}",
+                'prerequisites': prerequisites,
+                'due_date': result.get('due_date') or item['Due Date']
+            })
+
+            # Step 7: Queue for the single batched master-list write
+            logger.info("Step 7: Queueing item for master compliance list")
+            with write_lock:
+                master_records.append((item, prerequisites))
+
+            logger.info(f"Successfully processed: {item['Title']}")
+
+        # Check the disk cache first: items already processed in a previous
+        # run skip the search and LLM pipeline entirely
+        cached_pairs = []
+        to_search = []
+        for item in pending_items:
+            cached = get_cached_result(item)
+            if cached is not None:
+                logger.info(f"Cache hit for '{item['Title']}', skipping search and LLM")
+                cached_pairs.append((item, cached['search_results'], cached['result']))
+            else:
+                to_search.append(item)
+
+        # Step 3: Web search for prerequisites, fanned out across threads
+        # (network-bound, so threads overlap almost perfectly)
+        items_with_results = []
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            search_futures = {pool.submit(_search_one, item): item for item in to_search}
+            for future in as_completed(search_futures):
+                item = search_futures[future]
                 try:
-                    send_notification(
-                        to_email=item['Responsible Email'],
-                        subject=f"New Compliance Item: {item['Title']}",
-                        prerequisites=prerequisites,
-                        due_date=item['Due Date']
-                    )
-                except Exception as notify_err:
-                    logger.warning(f"Could not send notification (skipping to next step): {str(notify_err)}")
-                
-                # Step 7: Save to master list
-                logger.info("Step 7: Saving to master compliance list")
-                save_to_master(item, prerequisites, "data/excel/master_compliance.xlsx")
-                
-                logger.info(f"Successfully processed: {item['Title']}")
-                processed_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing item '{item.get('Title', 'Unknown')}': {str(e)}")
-                error_count += 1
-                continue
-        
+                    search_results = future.result()
+                    if not search_results:
+                        logger.warning(f"No search results found for '{item['Title']}'")
+                        continue
+                    items_with_results.append((item, search_results))
+                except Exception as e:
+                    logger.error(f"Error searching for item '{item.get('Title', 'Unknown')}': {str(e)}")
+                    error_count += 1
+
+        # Step 4: LLM extraction, batched to amortize per-request overhead
+        logger.info(f"Step 4: Extracting prerequisites using LLM ({len(items_with_results)} items, batches of 6)")
+        extraction_results = extract_prerequisites_batch(items_with_results, batch_size=6)
+
+        # Cache freshly computed results for future runs
+        for (item, search_results), result in zip(items_with_results, extraction_results):
+            set_cached_result(item, search_results, result)
+
+        finalize_inputs = cached_pairs + [
+            (item, search_results, result)
+            for (item, search_results), result in zip(items_with_results, extraction_results)
+        ]
+
+        # Steps 5-7: Store, notify, and save each item concurrently, sharing
+        # one buffered handle for the prerequisites text file
+        with open_prerequisites_file() as prereq_file, ThreadPoolExecutor(max_workers=8) as pool:
+            finalize_futures = {
+                pool.submit(_finalize_one, item, search_results, result, prereq_file): item
+                for item, search_results, result in finalize_inputs
+            }
+            for future in as_completed(finalize_futures):
+                item = finalize_futures[future]
+                try:
+                    future.result()
+                    processed_count += 1
+                except Exception as e:
+                    logger.error(f"Error processing item '{item.get('Title', 'Unknown')}': {str(e)}")
+                    error_count += 1
+
+        # Step 7 (deferred): One workbook open/save for the whole run
+        # instead of a full read-modify-write per item
+        if master_records:
+            logger.info(f"Step 7: Saving {len(master_records)} items to master compliance list")
+            save_to_master_batch(master_records, "data/excel/master_compliance.xlsx")
+
+        # Step 5 (deferred): Kick off the batched ingest on the background
+        # thread so it overlaps with the notification sends below
+        ingest_future = None
+        if vector_documents:
+            logger.info(f"Step 5: Storing {len(vector_documents)} documents in vector database")
+            ingest_future = flush_to_vector_db(vector_documents)
+
+        # Step 6 (deferred): Send all queued notifications concurrently
+        if notifications:
+            logger.info(f"Step 6: Sending {len(notifications)} notifications")
+            try:
+                send_notifications_bulk(notifications)
+            except Exception as notify_err:
+                logger.warning(f"Could not send notifications: {str(notify_err)}")
+
+        # Make sure the background ingest has persisted before reporting
+        if ingest_future is not None:
+            ingest_future.result()
+
         # Final summary
         logger.info(f"\n{'=' * 80}")
         logger.info("Workflow Summary:")
@@ -1,10 +1,16 @@
 """
 Send email notifications via Microsoft Outlook using Graph API and MSAL.
 """
+import aiohttp
+import asyncio
 import msal
 import requests
+import functools
+import html
 import logging
 import os
+import time
+from string import Template
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,16 +38,23 @@ class OutlookNotifier:
             client_credential=self.client_secret
         )
         
+        # Persistent session so repeated sends reuse one TCP/TLS connection
+        # to graph.microsoft.com instead of handshaking per email
+        self.session = requests.Session()
+
         self.token = None
+        self._token_expiry = 0.0
         self._acquire_token()
-    
+
     def _acquire_token(self):
         """Acquire access token using client credentials flow."""
         try:
             result = self.app.acquire_token_for_client(scopes=self.scope)
-            
+
             if "access_token" in result:
                 self.token = result["access_token"]
+                # Refresh one minute before the token actually expires
+                self._token_expiry = time.time() + result.get("expires_in", 3600) - 60
                 logger.info("Successfully acquired access token")
             else:
                 error = result.get("error_description", result.get("error"))
@@ -64,32 +77,20 @@ class OutlookNotifier:
             True if successful, False otherwise
         """
         try:
+            # Refresh the cached token only when it is close to expiry
+            if time.time() >= self._token_expiry:
+                self._acquire_token()
+
             endpoint = f"https://graph.microsoft.com/v1.0/users/{self.sender_email}/sendMail"
-            
+
             headers = {
                 "Authorization": f"Bearer {self.token}",
                 "Content-Type": "application/json"
             }
             
-            email_msg = {
-                "message": {
-                    "subject": subject,
-                    "body": {
-                        "contentType": "HTML",
-                        "content": body_html
-                    },
-                    "toRecipients": [
-                        {
-                            "emailAddress": {
-                                "address": to_email
-                            }
-                        }
-                    ]
-                },
-                "saveToSentItems": "true"
-            }
-            
-            response = requests.post(endpoint, headers=headers, json=email_msg)
+            email_msg = _build_email_payload(to_email, subject, body_html)
+
+            response = self.session.post(endpoint, headers=headers, json=email_msg)
             
             if response.status_code == 202:
                 logger.info(f"Email sent successfully to {to_email}")
@@ -102,6 +103,37 @@ class OutlookNotifier:
             logger.error(f"Error sending email: {str(e)}")
             return False
 
+def _build_email_payload(to_email, subject, body_html):
+    """Build the Graph sendMail JSON payload for one message."""
+    return {
+        "message": {
+            "subject": subject,
+            "body": {
+                "contentType": "HTML",
+                "content": body_html
+            },
+            "toRecipients": [
+                {
+                    "emailAddress": {
+                        "address": to_email
+                    }
+                }
+            ]
+        },
+        "saveToSentItems": "true"
+    }
+
+@functools.lru_cache(maxsize=1)
+def _get_notifier():
+    """
+    Return a shared OutlookNotifier instance.
+
+    Instantiating the notifier per email re-runs the MSAL token RPC and
+    opens a fresh TLS connection to Graph; caching one instance pays those
+    costs once per process.
+    """
+    return OutlookNotifier()
+
 def send_notification(to_email, subject, prerequisites, due_date):
     """
     Send compliance notification with prerequisites.
@@ -113,19 +145,36 @@ def send_notification(to_email, subject, prerequisites, due_date):
         due_date: Due date for compliance item
     """
     try:
-        notifier = OutlookNotifier()
-        
+        notifier = _get_notifier()
+
         # Create HTML email body
-        body_html = f"""
+        body_html = _build_body_html(prerequisites, due_date)
+
+        # Send email
+        success = notifier.send_email(to_email, subject, body_html)
+
+        if not success:
+            raise Exception("Failed to send notification email")
+
+        logger.info(f"Notification sent to {to_email}")
+
+    except Exception as e:
+        logger.error(f"Error sending notification: {str(e)}")
+        raise
+
+# Compiled once at module scope; string.Template avoids escaping the CSS
+# braces that an f-string/str.format would choke on, and substitution is a
+# single C-level pass instead of rebuilding ~1.5 KB of markup per email
+_EMAIL_TEMPLATE = Template("""
         <html>
         <head>
             <style>
-                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }}
-                .header {{ background-color: #0078d4; color: white; padding: 20px; }}
-                .content {{ padding: 20px; }}
-                .prerequisites {{ background-color: #f3f2f1; padding: 15px; border-left: 4px solid #0078d4; }}
-                .footer {{ padding: 20px; font-size: 12px; color: #605e5c; }}
-                .due-date {{ color: #d13438; font-weight: bold; }}
+                body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }
+                .header { background-color: #0078d4; color: white; padding: 20px; }
+                .content { padding: 20px; }
+                .prerequisites { background-color: #f3f2f1; padding: 15px; border-left: 4px solid #0078d4; }
+                .footer { padding: 20px; font-size: 12px; color: #605e5c; }
+                .due-date { color: #d13438; font-weight: bold; }
             </style>
         </head>
         <body>
@@ -135,13 +184,13 @@ def send_notification(to_email, subject, prerequisites, due_date):
             <div class="content">
                 <p>Hello,</p>
                 <p>You have been assigned a new compliance item that requires your attention.</p>
-                <p><strong>Due Date:</strong> <span class="due-date">{due_date}</span></p>
-                
+                <p><strong>Due Date:</strong> <span class="due-date">$due_date</span></p>
+
                 <div class="prerequisites">
                     <h2>Prerequisites and Requirements:</h2>
-                    <pre style="white-space: pre-wrap; font-family: 'Segoe UI', sans-serif;">{prerequisites}</pre>
+                    <pre style="white-space: pre-wrap; font-family: 'Segoe UI', sans-serif;">$prerequisites</pre>
                 </div>
-                
+
                 <p>Please review the prerequisites above and take necessary actions to ensure compliance by the due date.</p>
                 <p>If you have any questions or need clarification, please contact the compliance team.</p>
             </div>
@@ -151,16 +200,81 @@ def send_notification(to_email, subject, prerequisites, due_date):
             </div>
         </body>
         </html>
-        """
-        
-        # Send email
-        success = notifier.send_email(to_email, subject, body_html)
-        
-        if not success:
-            raise Exception("Failed to send notification email")
-        
-        logger.info(f"Notification sent to {to_email}")
-    
+        """)
+
+def _build_body_html(prerequisites, due_date):
+    """Build the HTML notification body for one compliance item."""
+    # Escape the LLM-derived text so markup-like characters render
+    # literally instead of breaking (or injecting into) the email HTML
+    return _EMAIL_TEMPLATE.substitute(
+        due_date=html.escape(str(due_date)),
+        prerequisites=html.escape(prerequisites)
+    )
+
+async def _send_one_async(session, notifier, message):
+    """POST one sendMail request on the shared aiohttp session."""
+    endpoint = f"https://graph.microsoft.com/v1.0/users/{notifier.sender_email}/sendMail"
+    headers = {
+        "Authorization": f"Bearer {notifier.token}",
+        "Content-Type": "application/json"
+    }
+    payload = _build_email_payload(
+        message['to_email'],
+        message['subject'],
+        _build_body_html(message['prerequisites'], message['due_date'])
+    )
+
+    async with session.post(endpoint, headers=headers, json=payload) as response:
+        if response.status == 202:
+            logger.info(f"Email sent successfully to {message['to_email']}")
+            return True
+        body = await response.text()
+        logger.error(f"Failed to send email to {message['to_email']}: {response.status} - {body}")
+        return False
+
+async def _send_all_async(notifier, messages):
+    """Fan all sendMail requests out over one pooled aiohttp session."""
+    connector = aiohttp.TCPConnector(limit=16)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *(_send_one_async(session, notifier, message) for message in messages),
+            return_exceptions=True
+        )
+
+    sent = 0
+    for message, result in zip(messages, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error sending email to {message['to_email']}: {str(result)}")
+        elif result:
+            sent += 1
+    return sent
+
+def send_notifications_bulk(messages):
+    """
+    Send a batch of compliance notifications concurrently.
+
+    Each Graph sendMail POST blocks for a few hundred milliseconds;
+    fanning them out over one aiohttp session collapses N serial
+    round-trips into roughly one.
+
+    Args:
+        messages: List of dicts with to_email, subject, prerequisites,
+            and due_date keys
+
+    Returns:
+        Number of messages sent successfully
+    """
+    if not messages:
+        return 0
+
+    try:
+        notifier = _get_notifier()
+        if time.time() >= notifier._token_expiry:
+            notifier._acquire_token()
+        sent = asyncio.run(_send_all_async(notifier, messages))
+        logger.info(f"Bulk notification complete: {sent}/{len(messages)} sent")
+        return sent
+
     except Exception as e:
-        logger.error(f"Error sending notification: {str(e)}")
-        raise
+        logger.error(f"Error sending bulk notifications: {str(e)}")
+        return 0
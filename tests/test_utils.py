@@ -26,6 +26,28 @@ def test_parse_date():
     assert date.month == 12
     assert date.day == 31
 
+def test_parse_date_formats():
+    """Pin the accepted date grammar across all supported formats."""
+    cases = {
+        '2024-12-31': datetime(2024, 12, 31),
+        '2024/12/31': datetime(2024, 12, 31),
+        '31/12/2024': datetime(2024, 12, 31),
+        '12/31/2024': datetime(2024, 12, 31),
+        '31-12-2024': datetime(2024, 12, 31),
+        'December 31, 2024': datetime(2024, 12, 31),
+        '31 December 2024': datetime(2024, 12, 31),
+        '2024-12-31 10:30:00': datetime(2024, 12, 31, 10, 30),
+        # Day-first wins over month-first for slash dates
+        '05/06/2024': datetime(2024, 6, 5),
+        # Month-first with dashes is not in the grammar
+        '12-25-2023': None,
+        # Invalid calendar date
+        '2024-02-30': None,
+        'not a date': None,
+    }
+    for raw, expected in cases.items():
+        assert parse_date(raw) == expected
+
 def test_normalize_title():
     """Test title normalization."""
     assert normalize_title("Test Title!") == "test title"
@@ -14,6 +14,11 @@ ISO_LEAD_TIMES = {
     "ISO 20000 - IT Service Management": 120,
 }
 
+# Canonical ISO_LEAD_TIMES key per standard number, built once at import
+# so title parsers resolve e.g. 9001 -> "ISO 9001 - Quality Management"
+# in one dict lookup instead of a substring scan over the keys
+ISO_STANDARD_LOOKUP = {int(key.split()[1]): key for key in ISO_LEAD_TIMES}
+
 # Activity type adjustments (add or subtract days)
 ISO_ACTIVITY_ADJUSTMENTS = {
     "New Certification": 30,
@@ -0,0 +1,73 @@
+"""
+Vectorized kernels for batch due-date arithmetic.
+
+The static-mapping fallback is pure integer math (base lead time plus an
+activity adjustment per item). For nightly scans over thousands of rows
+the per-item timedelta arithmetic and dict lookups add up, so the
+mapping tables are flattened once at import into parallel int32 arrays
+(an SoA layout) and the per-batch math runs as one array operation.
+
+The kernel is JIT-compiled with numba when it is installed; the plain
+numpy version is already vectorized and is the fallback, so numba stays
+an optional dependency.
+"""
+import logging
+
+import numpy as np
+
+from utils.compliance_mappings import (
+    ISO_LEAD_TIMES,
+    ISO_ACTIVITY_ADJUSTMENTS,
+    DEFAULT_LEAD_TIME,
+)
+
+logger = logging.getLogger("ComplianceAssistant.DueDateKernels")
+
+# Index maps built once at import; slot 0 of each value array is the
+# default used for unknown standards / activities
+STANDARD_INDEX = {name: i for i, name in enumerate(ISO_LEAD_TIMES, 1)}
+ACTIVITY_INDEX = {name: i for i, name in enumerate(ISO_ACTIVITY_ADJUSTMENTS, 1)}
+
+_BASE_DAYS = np.array(
+    [DEFAULT_LEAD_TIME] + list(ISO_LEAD_TIMES.values()), dtype=np.int32
+)
+_ADJ_DAYS = np.array(
+    [0] + list(ISO_ACTIVITY_ADJUSTMENTS.values()), dtype=np.int32
+)
+
+def _compute_due_days(standard_idx, activity_idx, base, adj):
+    """Total days to add per item: base lead time plus adjustment."""
+    return base[standard_idx] + adj[activity_idx]
+
+try:
+    import numba
+
+    compute_due_days = numba.njit(cache=True)(_compute_due_days)
+except ImportError:
+    compute_due_days = _compute_due_days
+
+def batch_due_dates(standards, activities, application_dates):
+    """
+    Compute due dates for a batch of items in one vectorized pass.
+
+    Args:
+        standards: Sequence of standard names (unknown names get the
+            default lead time)
+        activities: Sequence of activity-type names, aligned with
+            standards
+        application_dates: Array-like coercible to numpy datetime64[D]
+
+    Returns:
+        numpy datetime64[D] array of due dates aligned with the input
+    """
+    standard_idx = np.array(
+        [STANDARD_INDEX.get(s, 0) for s in standards], dtype=np.int64
+    )
+    activity_idx = np.array(
+        [ACTIVITY_INDEX.get(a, 0) for a in activities], dtype=np.int64
+    )
+
+    days = compute_due_days(standard_idx, activity_idx, _BASE_DAYS, _ADJ_DAYS)
+
+    starts = np.asarray(application_dates, dtype='datetime64[D]')
+    return starts + days.astype('timedelta64[D]')
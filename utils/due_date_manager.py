@@ -2,17 +2,29 @@
 Production-grade due date calculation with multi-source intelligence
 and confidence scoring.
 """
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Tuple, Dict, Optional
+import functools
+from typing import Dict, Optional
+import json
 import logging
+import re
 from dataclasses import dataclass
 from enum import Enum
-import os
-import json
-from pathlib import Path
+
+from utils.compliance_mappings import ISO_STANDARD_LOOKUP
 
 logger = logging.getLogger("ComplianceAssistant.DueDateManager")
 
+# Compiled once; _parse_cert_info_cached runs it on every distinct title
+_ISO_NUM_RE = re.compile(r'ISO\s*(\d+)')
+
+# Pulls the first JSON object out of an LLM response
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# One DFA pass per URL instead of one substring scan per official domain
+_OFFICIAL_DOMAIN_RE = re.compile(r'iso\.org|bis\.gov\.in|bsigroup\.com|tuv\.com|gov\.in')
+
 
 class CalculationMethod(Enum):
     """Track which method was used for transparency"""
@@ -60,15 +72,116 @@ class DueDateManager:
             CalculationMethod.STATIC_MAPPING: 0.60,
             CalculationMethod.CONSERVATIVE_DEFAULT: 0.40
         }
-    
+
+        # Memo of completed calculations: weekly/monthly batches repeat
+        # the same (title, application date) pairs, and re-running the
+        # whole fallback chain for them is pure waste
+        self._cache: Dict[tuple, DueDateResult] = {}
+
     def calculate_due_date(
-        self, 
-        item: Dict, 
+        self,
+        item: Dict,
         search_results: Optional[list] = None
     ) -> DueDateResult:
         """
         Calculate due date using intelligent fallback strategy.
+
+        Results are memoized on (title, application date, whether search
+        results were supplied); conservative defaults are never cached so
+        a later call with better data can still upgrade the answer.
         """
+        key = (
+            item.get('Title'),
+            str(item.get('Application Date')),
+            search_results is not None
+        )
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._calculate_uncached(item, search_results)
+        if result.method is not CalculationMethod.CONSERVATIVE_DEFAULT:
+            self._cache[key] = result
+        return result
+
+    def calculate_due_dates_batch(
+        self,
+        items: list,
+        search_results_list: Optional[list] = None
+    ) -> list:
+        """
+        Calculate due dates for a batch of items in one pass.
+
+        Items that need the full fallback chain (search results supplied,
+        regulatory-database hit, or non-ISO titles) go through
+        calculate_due_date individually. The rest — ISO items that would
+        land on the static mapping anyway — have their lead-time
+        arithmetic vectorized through batch_due_dates, so the per-item
+        datetime/timedelta constructions collapse into one numpy
+        operation and DueDateResult objects are built only at the end.
+
+        Args:
+            items: List of item dictionaries
+            search_results_list: Optional list of search results aligned
+                with items (None entries skip LLM extraction)
+
+        Returns:
+            List of DueDateResult aligned with items
+        """
+        try:
+            from utils.due_date_kernels import batch_due_dates
+        except ImportError:
+            batch_due_dates = None
+
+        if search_results_list is None:
+            search_results_list = [None] * len(items)
+
+        results = [None] * len(items)
+        static_indices = []
+
+        for i, (item, search_results) in enumerate(zip(items, search_results_list)):
+            cert_info = self._parse_certification_info(item)
+            vectorizable = (
+                batch_due_dates is not None
+                and search_results is None
+                and cert_info['standard_key'] is not None
+                and self.regulatory_db.lookup(
+                    cert_info['standard'], cert_info['activity_type']
+                ) is None
+            )
+            if vectorizable:
+                static_indices.append(i)
+            else:
+                results[i] = self.calculate_due_date(item, search_results)
+
+        if static_indices:
+            app_dates = [
+                self._parse_application_date(items[i].get('Application Date'))
+                for i in static_indices
+            ]
+            due = batch_due_dates(
+                [self._parse_certification_info(items[i])['standard_key']
+                 for i in static_indices],
+                ['New Certification'] * len(static_indices),
+                app_dates
+            )
+            for i, dd in zip(static_indices, due):
+                results[i] = DueDateResult(
+                    due_date=datetime.combine(dd.astype(object), datetime.min.time()),
+                    method=CalculationMethod.STATIC_MAPPING,
+                    confidence=0.6,
+                    validity_period="Default mapping",
+                    source_urls=[],
+                    calculation_notes="Used static default lead times as fallback."
+                )
+
+        return results
+
+    def _calculate_uncached(
+        self,
+        item: Dict,
+        search_results: Optional[list] = None
+    ) -> DueDateResult:
         application_date = self._parse_application_date(item.get('Application Date'))
         
         logger.info(f"Calculating due date for: {item['Title']}")
@@ -165,7 +278,10 @@ class DueDateManager:
             return None
         cert_info = self._parse_certification_info(item)
         if 'ISO' in item['Title']:
-            dd = get_iso_due_date(cert_info['standard'] or item['Title'], "New Certification", application_date)
+            dd = get_iso_due_date(
+                cert_info['standard_key'] or cert_info['standard'] or item['Title'],
+                "New Certification", application_date
+            )
         else:
             dd = get_india_due_date(item['Title'], application_date)
         
@@ -198,31 +314,42 @@ class DueDateManager:
         except: return datetime.now()
 
     def _parse_certification_info(self, item):
-        title = item.get('Title', '')
-        info = {'standard': None, 'activity_type': 'New Certification', 'region': 'Global'}
-        import re
-        iso_match = re.search(r'ISO\s*(\d+)', title)
-        if iso_match: info['standard'] = f"ISO {iso_match.group(1)}"
-        return info
+        # Copy so callers can mutate without poisoning the cache
+        return dict(_parse_cert_info_cached(item.get('Title', '')))
 
     def _filter_official_sources(self, results):
-        official = ['iso.org', 'bis.gov.in', 'bsigroup.com', 'tuv.com', 'gov.in']
-        return [r for r in results if any(o in r.get('url', '').lower() for o in official)]
+        return [r for r in results if _OFFICIAL_DOMAIN_RE.search(r.get('url', '').lower())]
 
     def _find_consensus(self, data):
         if not data: return None
-        from collections import Counter
         periods = [d['validity_period'] for d in data]
         common, count = Counter(periods).most_common(1)[0]
         return {'validity_period': common, 'confidence': (count/len(data)) * 0.9}
 
     def _calculate_from_validity_period(self, start, period):
-        import re
         num = re.search(r'(\d+)', period)
         val = int(num.group(1)) if num else 1
         if 'year' in period.lower(): return start + timedelta(days=val*365)
         return start + timedelta(days=val*30)
 
+@functools.lru_cache(maxsize=512)
+def _parse_cert_info_cached(title):
+    """Parse standard/activity info out of a title, memoized: the regex
+    and result are identical for every repeat of the same title."""
+    info = {
+        'standard': None,
+        'standard_key': None,
+        'activity_type': 'New Certification',
+        'region': 'Global'
+    }
+    iso_match = _ISO_NUM_RE.search(title)
+    if iso_match:
+        info['standard'] = f"ISO {iso_match.group(1)}"
+        # Canonical ISO_LEAD_TIMES key resolved here once, so the static
+        # mapping never has to match the title against keys by substring
+        info['standard_key'] = ISO_STANDARD_LOOKUP.get(int(iso_match.group(1)))
+    return info
+
 class RegulatoryDatabase:
     def __init__(self):
         self.db = {"ISO_9001": {"lead_time_days": 1095, "validity_period": "3 Years", "confidence": 0.99}}
@@ -239,16 +366,19 @@ class LLMDueDateExtractor:
     def __init__(self):
         try:
             from llm.llm_client import get_llm_client
+            from langchain_core.prompts import ChatPromptTemplate
             self.llm = get_llm_client()
-        except: self.llm = None
+            # Built once: template construction re-parses the placeholder
+            # string, which is pure waste per extraction call
+            self._prompt = ChatPromptTemplate.from_template("Extract validity period for {title} from: {text}. Output JSON: {{\"validity_period\": \"3 years\"}}")
+        except:
+            self.llm = None
+            self._prompt = None
     def extract_validity_period(self, text, url, title):
         if not self.llm: return None
-        from langchain_core.prompts import ChatPromptTemplate
-        prompt = ChatPromptTemplate.from_template("Extract validity period for {title} from: {text}. Output JSON: {{\"validity_period\": \"3 years\"}}")
         try:
-            res = self.llm.invoke(prompt.format(title=title, text=text[:2000]))
-            import json, re
-            m = re.search(r'\{.*\}', res.content, re.DOTALL)
+            res = self.llm.invoke(self._prompt.format(title=title, text=text[:2000]))
+            m = _JSON_RE.search(res.content)
             if m:
                 data = json.loads(m.group(0))
                 return {'validity_period': data['validity_period'], 'source_url': url}
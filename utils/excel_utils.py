@@ -1,25 +1,68 @@
 """
 Excel utilities for reading, writing, and managing compliance data.
 """
+import csv
 import pandas as pd
+from openpyxl import load_workbook
 from pathlib import Path
 import hashlib
 import logging
 
 logger = logging.getLogger("ComplianceAssistant.ExcelUtils")
 
+# Prefer the Rust-backed calamine engine for .xlsx reads when installed;
+# engine=None lets pandas fall back to openpyxl otherwise
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_ENGINE = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+def _item_fingerprint(item):
+    """Fingerprint an item by Title + Description.
+
+    Not a security hash — it only needs to be fast and stable. xxh3 is
+    several times quicker than md5 on short strings; blake2b with a
+    short digest is the stdlib fallback.
+    """
+    data = f"{item['Title']}{item['Description']}".encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def _legacy_md5(item):
+    """md5 fingerprint used by older master files."""
+    return hashlib.md5(
+        f"{item['Title']}{item['Description']}".encode()
+    ).hexdigest()
+
 def read_new_items(file_path):
     """
-    Read new compliance items from Excel submission form.
-    
+    Read new compliance items from the submissions file.
+
     Args:
-        file_path: Path to Excel file with new submissions
-    
+        file_path: Path to submissions file (.csv or Excel)
+
     Returns:
         List of dictionaries containing item data
     """
     try:
-        df = pd.read_excel(file_path)
+        # The Streamlit form appends to a CSV; Excel is still accepted
+        # for files produced elsewhere
+        if str(file_path).endswith('.csv'):
+            df = pd.read_csv(file_path)
+        else:
+            # dtype hints skip per-cell type inference on the text columns
+            df = pd.read_excel(
+                file_path,
+                engine=_EXCEL_ENGINE,
+                dtype={'Title': str, 'Description': str, 'Responsible Email': str}
+            )
         
         # Validate required columns
         required_cols = ['Title', 'Description', 'Responsible Email', 'Due Date']
@@ -36,79 +79,263 @@ def read_new_items(file_path):
         logger.error(f"Error reading Excel file {file_path}: {str(e)}")
         raise
 
+def iter_new_items(file_path):
+    """
+    Stream new compliance items one row at a time.
+
+    Generator counterpart to read_new_items for large files: Excel rows
+    come through openpyxl's read-only mode, which keeps a constant-size
+    window instead of materializing the whole workbook and a DataFrame,
+    so callers can pipeline processing at a fraction of the peak memory.
+
+    Args:
+        file_path: Path to submissions file (.csv or Excel)
+
+    Yields:
+        One dictionary per row, keyed by the header row
+    """
+    path = str(file_path)
+
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+        return
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(col) for col in next(rows)]
+        for row in rows:
+            yield dict(zip(header, row))
+    finally:
+        wb.close()
+
+def load_master_titles(master_file):
+    """
+    Load normalized titles from the master compliance list in one read.
+
+    Batch callers should look items up in the returned set rather than
+    calling check_duplicate per item, which re-parses the Excel file on
+    every call.
+
+    Args:
+        master_file: Path to master compliance Excel file
+
+    Returns:
+        Set of lowercased, stripped titles (empty if no master file)
+    """
+    try:
+        if not Path(master_file).exists():
+            logger.info("Master file doesn't exist, no existing titles to load")
+            return set()
+
+        df = pd.read_excel(
+            master_file,
+            engine=_EXCEL_ENGINE,
+            usecols=lambda col: col == 'Title',
+            dtype=str
+        )
+        if 'Title' not in df.columns:
+            return set()
+
+        titles = {str(title).strip().lower() for title in df['Title'].dropna()}
+        logger.info(f"Loaded {len(titles)} existing titles from master list")
+        return titles
+
+    except Exception as e:
+        logger.error(f"Error loading master titles: {str(e)}")
+        return set()
+
+class DuplicateChecker:
+    """
+    Answers duplicate checks for a whole batch from one master-file read.
+
+    check_duplicate re-parses the master Excel file on every call, which
+    is one full read per item when screening a batch. This loads the
+    Item Hash and Title columns once into sets, so each check is two
+    O(1) membership tests.
+    """
+
+    def __init__(self, master_file):
+        self.hashes = set()
+        self.titles = set()
+
+        if not Path(master_file).exists():
+            logger.info("Master file doesn't exist, no duplicates possible")
+            return
+
+        # Only the two lookup columns are parsed; dtype=str skips type
+        # inference on them
+        df = pd.read_excel(
+            master_file,
+            engine=_EXCEL_ENGINE,
+            usecols=lambda col: col in ('Item Hash', 'Title'),
+            dtype=str
+        )
+        if 'Item Hash' in df.columns:
+            self.hashes = set(df['Item Hash'].dropna())
+        if 'Title' in df.columns:
+            self.titles = set(df['Title'].dropna())
+
+        # Rows written before the xxhash switch carry 32-hex md5 values;
+        # remember whether any exist so check() knows to try both
+        self._has_legacy = any(len(h) == 32 for h in self.hashes)
+
+    def check(self, item):
+        """Return True if the item's hash or title is already known."""
+        if self.hashes:
+            if _item_fingerprint(item) in self.hashes:
+                return True
+            return self._has_legacy and _legacy_md5(item) in self.hashes
+
+        # Fallback: check title match
+        return str(item['Title']) in self.titles
+
 def check_duplicate(item, master_file):
     """
     Check if an item already exists in the master compliance list.
-    
+
+    Batch callers should build one DuplicateChecker and call check per
+    item instead, which reads the master file once rather than per call.
+
     Args:
         item: Dictionary containing item data
         master_file: Path to master compliance Excel file
-    
+
     Returns:
         True if duplicate exists, False otherwise
     """
     try:
-        # Create hash of title + description for exact matching
-        item_hash = hashlib.md5(
-            f"{item['Title']}{item['Description']}".encode()
-        ).hexdigest()
-        
-        # Read master file if it exists
-        if not Path(master_file).exists():
-            logger.info("Master file doesn't exist, creating new one")
-            return False
-        
-        df = pd.read_excel(master_file)
-        
-        # Check if hash column exists
-        if 'Item Hash' in df.columns:
-            return item_hash in df['Item Hash'].values
-        
-        # Fallback: check title match
-        return item['Title'] in df['Title'].values
-    
+        return DuplicateChecker(master_file).check(item)
+
     except Exception as e:
         logger.error(f"Error checking duplicates: {str(e)}")
         return False
 
+def filter_new_items(candidates, master_file):
+    """
+    Drop candidates already present in the master list in one pass.
+
+    Vectorized front door for batch dedupe: the master hashes are read
+    once (via DuplicateChecker), the candidate fingerprints are computed
+    as a single pandas column, and membership is one isin against the
+    hash set — instead of one master-file read and one hash per call.
+
+    Args:
+        candidates: List of item dictionaries to screen
+        master_file: Path to master compliance Excel file
+
+    Returns:
+        List of item dictionaries not yet in the master list
+    """
+    if not candidates:
+        return []
+
+    try:
+        checker = DuplicateChecker(master_file)
+        if not checker.hashes and not checker.titles:
+            return list(candidates)
+
+        df = pd.DataFrame(candidates)
+        keys = df['Title'].astype(str) + df['Description'].astype(str)
+
+        if checker.hashes:
+            if xxhash is not None:
+                fingerprints = keys.map(
+                    lambda s: xxhash.xxh3_64(s.encode()).hexdigest()
+                )
+            else:
+                fingerprints = keys.map(
+                    lambda s: hashlib.blake2b(s.encode(), digest_size=8).hexdigest()
+                )
+            duplicate = fingerprints.isin(checker.hashes)
+            if checker._has_legacy:
+                duplicate |= keys.map(
+                    lambda s: hashlib.md5(s.encode()).hexdigest()
+                ).isin(checker.hashes)
+        else:
+            duplicate = df['Title'].astype(str).isin(checker.titles)
+
+        kept = df[~duplicate].to_dict('records')
+        logger.info(f"Filtered {len(candidates) - len(kept)} duplicates from batch of {len(candidates)}")
+        return kept
+
+    except Exception as e:
+        logger.error(f"Error filtering duplicates: {str(e)}")
+        return list(candidates)
+
+# Column order of the master sheet; openpyxl appends must match it
+_MASTER_COLUMNS = [
+    'Title', 'Description', 'Responsible Email', 'Due Date',
+    'Prerequisites', 'Item Hash', 'Status'
+]
+
+def _master_row(item, prerequisites):
+    """Build one master-list row dict for an item."""
+    item_hash = _item_fingerprint(item)
+
+    return {
+        'Title': item['Title'],
+        'Description': item['Description'],
+        'Responsible Email': item['Responsible Email'],
+        'Due Date': item['Due Date'],
+        'Prerequisites': prerequisites,
+        'Item Hash': item_hash,
+        'Status': 'Notified'
+    }
+
+def _append_master_rows(rows, master_file):
+    """Write rows to the master file: openpyxl append when it exists,
+    a fresh pandas write (with header) when it does not."""
+    if Path(master_file).exists():
+        # Append in place instead of the read_excel/concat/to_excel
+        # round-trip, which re-parses and rewrites every existing row
+        wb = load_workbook(master_file)
+        ws = wb.active
+        for row in rows:
+            ws.append([row[col] for col in _MASTER_COLUMNS])
+        wb.save(master_file)
+    else:
+        Path(master_file).parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(rows, columns=_MASTER_COLUMNS).to_excel(master_file, index=False)
+
 def save_to_master(item, prerequisites, master_file):
     """
     Save processed item to master compliance list.
-    
+
     Args:
         item: Dictionary containing item data
         prerequisites: Extracted prerequisites text
         master_file: Path to master compliance Excel file
     """
     try:
-        # Create item hash
-        item_hash = hashlib.md5(
-            f"{item['Title']}{item['Description']}".encode()
-        ).hexdigest()
-        
-        # Prepare new row
-        new_row = {
-            'Title': item['Title'],
-            'Description': item['Description'],
-            'Responsible Email': item['Responsible Email'],
-            'Due Date': item['Due Date'],
-            'Prerequisites': prerequisites,
-            'Item Hash': item_hash,
-            'Status': 'Notified'
-        }
-        
-        # Read existing or create new DataFrame
-        if Path(master_file).exists():
-            df = pd.read_excel(master_file)
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        else:
-            df = pd.DataFrame([new_row])
-        
-        # Save to Excel
-        Path(master_file).parent.mkdir(parents=True, exist_ok=True)
-        df.to_excel(master_file, index=False)
+        _append_master_rows([_master_row(item, prerequisites)], master_file)
         logger.info(f"Saved item '{item['Title']}' to master list")
-    
+
     except Exception as e:
         logger.error(f"Error saving to master file: {str(e)}")
         raise
+
+def save_to_master_batch(items_with_prereqs, master_file):
+    """
+    Save a batch of processed items to the master list in one write.
+
+    Batch callers accumulate (item, prerequisites) pairs during a run
+    and flush once, so the workbook is opened and saved a single time
+    instead of once per item.
+
+    Args:
+        items_with_prereqs: List of (item, prerequisites) tuples
+        master_file: Path to master compliance Excel file
+    """
+    if not items_with_prereqs:
+        return
+
+    try:
+        rows = [_master_row(item, prereqs) for item, prereqs in items_with_prereqs]
+        _append_master_rows(rows, master_file)
+        logger.info(f"Saved {len(rows)} items to master list")
+
+    except Exception as e:
+        logger.error(f"Error saving batch to master file: {str(e)}")
+        raise
@@ -3,9 +3,17 @@ General helper utilities for the Compliance Assistant.
 """
 from datetime import datetime, timedelta
 import logging
+import numpy as np
+
+from utils.data_cleaning import parse_date
 
 logger = logging.getLogger("ComplianceAssistant.Helpers")
 
+# Urgency band edges in days-until-due and the label for each band;
+# searchsorted over these replaces the per-item branch ladder
+_URGENCY_THRESHOLDS = np.array([-1, 3, 7, 14])
+_URGENCY_LABELS = np.array(['critical', 'critical', 'high', 'medium', 'low'])
+
 def format_date(date_obj, format_str='%Y-%m-%d'):
     """
     Format datetime object to string.
@@ -25,43 +33,45 @@ def format_date(date_obj, format_str='%Y-%m-%d'):
     
     return date_obj.strftime(format_str)
 
-def is_overdue(due_date):
+def is_overdue(due_date, *, now=None):
     """
     Check if a compliance item is overdue.
-    
+
     Args:
         due_date: Due date (datetime or string)
-    
+        now: Reference time; batch callers should snapshot datetime.now()
+            once before their loop and pass it here
+
     Returns:
         True if overdue, False otherwise
     """
     if isinstance(due_date, str):
-        from utils.data_cleaning import parse_date
         due_date = parse_date(due_date)
-    
+
     if not due_date:
         return False
-    
-    return datetime.now() > due_date
 
-def get_urgency_level(due_date):
+    return (now or datetime.now()) > due_date
+
+def get_urgency_level(due_date, *, now=None):
     """
     Determine urgency level based on due date.
-    
+
     Args:
         due_date: Due date (datetime or string)
-    
+        now: Reference time; batch callers should snapshot datetime.now()
+            once before their loop and pass it here
+
     Returns:
         Urgency level: 'critical', 'high', 'medium', 'low'
     """
     if isinstance(due_date, str):
-        from utils.data_cleaning import parse_date
         due_date = parse_date(due_date)
-    
+
     if not due_date:
         return 'low'
-    
-    days_until_due = (due_date - datetime.now()).days
+
+    days_until_due = (due_date - (now or datetime.now())).days
     
     if days_until_due < 0:
         return 'critical'  # Overdue
@@ -74,6 +84,26 @@ def get_urgency_level(due_date):
     else:
         return 'low'
 
+def get_urgency_levels(due_dates):
+    """
+    Classify many due dates in one vectorized pass.
+
+    Dashboard callers that classify N items should use this instead of
+    N get_urgency_level calls: the day arithmetic and band lookup run as
+    two C-level array operations rather than a Python branch ladder per
+    item.
+
+    Args:
+        due_dates: Array-like of due dates coercible to numpy datetime64
+
+    Returns:
+        numpy array of urgency labels aligned with due_dates
+    """
+    due_dates = np.asarray(due_dates, dtype='datetime64[D]')
+    days = (due_dates - np.datetime64('today', 'D')).astype('int64')
+    idx = np.searchsorted(_URGENCY_THRESHOLDS, days, side='left')
+    return _URGENCY_LABELS[idx]
+
 def truncate_text(text, max_length=100):
     """
     Truncate text to specified length.
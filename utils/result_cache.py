@@ -0,0 +1,84 @@
+"""
+Disk-backed cache for web search and LLM extraction results.
+
+Compliance item titles repeat across runs; caching the expensive
+search + LLM pipeline output per item content means re-runs skip the
+network entirely.
+"""
+import hashlib
+import logging
+import shelve
+from pathlib import Path
+
+logger = logging.getLogger("ComplianceAssistant.ResultCache")
+
+DEFAULT_CACHE_PATH = "data/cache/result_cache"
+
+
+def cache_key(item):
+    """
+    Build a stable content hash for a compliance item.
+
+    Args:
+        item: Compliance item dictionary
+
+    Returns:
+        Hex digest keyed on title, description, and application date
+    """
+    raw = "|".join([
+        str(item.get('Title', '')),
+        str(item.get('Description', '')),
+        str(item.get('Application Date', ''))
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_cached_result(item, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Look up a previously processed item.
+
+    Args:
+        item: Compliance item dictionary
+        cache_path: Path of the shelve database
+
+    Returns:
+        Dict with 'search_results' and 'result' keys, or None on miss
+    """
+    try:
+        if not Path(cache_path).parent.exists():
+            return None
+        with shelve.open(cache_path) as cache:
+            return cache.get(cache_key(item))
+    except Exception as e:
+        logger.warning(f"Error reading result cache: {str(e)}")
+        return None
+
+
+def set_cached_result(item, search_results, result, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Store the pipeline output for an item.
+
+    Fallback results from a failed LLM call (marked by due_date=None)
+    are never cached — the cache has no TTL, so caching them would pin
+    the item to degraded snippet output forever. Same rule
+    DueDateManager applies to conservative defaults.
+
+    Args:
+        item: Compliance item dictionary
+        search_results: Enriched search results for the item
+        result: Extraction result dictionary
+        cache_path: Path of the shelve database
+    """
+    if not result or result.get('due_date') is None:
+        logger.info("Skipping cache write for fallback result")
+        return
+
+    try:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        with shelve.open(cache_path) as cache:
+            cache[cache_key(item)] = {
+                'search_results': search_results,
+                'result': result
+            }
+    except Exception as e:
+        logger.warning(f"Error writing result cache: {str(e)}")